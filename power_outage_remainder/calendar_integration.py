@@ -4,25 +4,48 @@ The module provides a small helper to obtain an authenticated service and create
 It uses the installed-app OAuth flow.
 """
 
-from typing import Dict
-import pickle
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+import functools
+import json
+import os
+import tempfile
 from pathlib import Path
 
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
 
+# Google's documented limit of sub-requests per batch HTTP request
+BATCH_SIZE = 50
+
+# Maximum page size accepted by events.list
+MAX_RESULTS = 2500
+
 
 def get_service(credentials_path: str, token_path: str, scopes=None):
     """Return an authorized Google Calendar service instance.
 
     credentials_path: path to OAuth client secrets JSON (from Google Cloud Console)
-    token_path: path where to save token (json/pickle)
+    token_path: path where to save the token (authorized user JSON)
+
+    The service is cached per (credentials_path, token_path, scopes), so
+    repeated calls in one process reuse its HTTP connection instead of
+    re-authorizing and opening a new TLS connection.
 
     Raises RuntimeError with actionable message if google libraries are missing.
     """
     if scopes is None:
         scopes = SCOPES
 
+    return _build_service(str(credentials_path), str(token_path), tuple(scopes))
+
+
+@functools.lru_cache(maxsize=8)
+def _build_service(credentials_path: str, token_path: str, scopes: Tuple[str, ...]):
+    """Authorize and build the Calendar service; see get_service."""
+    scopes = list(scopes)
+
     try:
         from google.auth.transport.requests import Request
         from google.oauth2.credentials import Credentials
@@ -37,15 +60,14 @@ def get_service(credentials_path: str, token_path: str, scopes=None):
     token_file = Path(token_path)
     if token_file.exists():
         try:
-            creds = Credentials.from_authorized_user_file(str(token_file), scopes)
+            info = json.loads(token_file.read_bytes())
+            creds = Credentials.from_authorized_user_info(info, scopes)
         except Exception:
-            # fallback to pickle
-            try:
-                with open(token_file, "rb") as fh:
-                    creds = pickle.load(fh)
-            except Exception:
-                creds = None
+            # unreadable or invalid token; fall through to a fresh login
+            creds = None
 
+    # creds.valid is false only when the access token is missing or close to
+    # expiry, so a token refreshed by a previous run is reused as-is.
     if not creds or not creds.valid:
         if creds and creds.expired and creds.refresh_token:
             creds.refresh(Request())
@@ -54,17 +76,24 @@ def get_service(credentials_path: str, token_path: str, scopes=None):
                 str(credentials_path), scopes
             )
             creds = flow.run_local_server(port=0)
-        # Save the credentials for the next run
+        # Save the credentials for the next run. Write to a uniquely named
+        # temporary file and swap it in so a concurrent run never reads (or
+        # writes into) a half-written token.
+        tmp_name = None
         try:
-            with open(token_file, "w", encoding="utf-8") as fh:
+            fd, tmp_name = tempfile.mkstemp(
+                dir=token_file.parent, prefix=token_file.name + ".", suffix=".tmp"
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
                 fh.write(creds.to_json())
+            os.replace(tmp_name, token_file)
         except Exception:
-            try:
-                with open(token_file, "wb") as fh:
-                    pickle.dump(creds, fh)
-            except Exception:
-                # best-effort; ignore failures
-                pass
+            # best-effort; ignore failures but don't leave the temp file behind
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
 
     service = build("calendar", "v3", credentials=creds)
     return service
@@ -79,16 +108,78 @@ def create_event(service, calendar_id: str, event_body: Dict) -> Dict:
     return created
 
 
+def create_events_batch(
+    service, calendar_id: str, events: List[Dict]
+) -> List[Dict | Exception]:
+    """Insert events using batch HTTP requests instead of one round-trip each.
+
+    Inserts are packed into batches of at most BATCH_SIZE sub-requests.
+    Returns one entry per input event, in the same order: the created event
+    resource, or the exception reported for that particular insert.
+    """
+    results: List[Dict | Exception] = [{} for _ in events]
+
+    def _callback(request_id, response, exception):
+        results[int(request_id)] = exception if exception is not None else response
+
+    for offset in range(0, len(events), BATCH_SIZE):
+        batch = service.new_batch_http_request(callback=_callback)
+        for i, event in enumerate(events[offset : offset + BATCH_SIZE], start=offset):
+            batch.add(
+                service.events().insert(calendarId=calendar_id, body=event),
+                request_id=str(i),
+            )
+        batch.execute()
+
+    return results
+
+
+async def create_events_batch_async(
+    service, calendar_id: str, events: List[Dict]
+) -> Tuple[int, int]:
+    """Run create_events_batch off the event loop thread and report each insert.
+
+    The batch HTTP calls are blocking, so they run in the loop's default
+    executor. Prints one line per event and returns (created, failed) counts.
+    """
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(
+        None, create_events_batch, service, calendar_id, events
+    )
+
+    created = failed = 0
+    for event, result in zip(events, results):
+        if isinstance(result, Exception):
+            print(f"  ✗ Failed to create {event['summary']}: {result}")
+            failed += 1
+            continue
+        print(f"  ✓ Created: {result.get('htmlLink')}")
+        created += 1
+
+    return created, failed
+
+
 def list_events(
-    service, calendar_id: str, time_min: str | None = None, time_max: str | None = None
+    service,
+    calendar_id: str,
+    time_min: str | None = None,
+    time_max: str | None = None,
+    fields: str | None = None,
 ):
     """Return a generator of events in the given time window.
 
     time_min and time_max should be RFC3339 timestamp strings (ISO with offset).
     If omitted, the API will return upcoming events according to its defaults.
+    fields is an optional partial-response mask (e.g.
+    "nextPageToken,items(id,summary)"); it must include nextPageToken for
+    paging to work.
+
+    The next page is requested in a background thread while the caller
+    consumes the current one, so don't issue other requests on the same
+    service from inside the loop.
     """
-    page_token = None
-    while True:
+
+    def _fetch_page(page_token):
         req = service.events().list(
             calendarId=calendar_id,
             timeMin=time_min,
@@ -96,14 +187,22 @@ def list_events(
             singleEvents=True,
             showDeleted=False,
             orderBy="startTime",
+            maxResults=MAX_RESULTS,
+            fields=fields,
             pageToken=page_token,
         )
-        resp = req.execute()
-        for ev in resp.get("items", []):
-            yield ev
-        page_token = resp.get("nextPageToken")
-        if not page_token:
-            break
+        return req.execute()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        resp = _fetch_page(None)
+        while True:
+            page_token = resp.get("nextPageToken")
+            next_page = pool.submit(_fetch_page, page_token) if page_token else None
+            for ev in resp.get("items", []):
+                yield ev
+            if next_page is None:
+                break
+            resp = next_page.result()
 
 
 def delete_event(service, calendar_id: str, event_id: str):
@@ -5,7 +5,9 @@ Fetches messages from Telegram channel, extracts outage schedules, and creates c
 
 import argparse
 import asyncio
+import functools
 import os
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -38,6 +40,49 @@ except ImportError:
         """
 
 
+@dataclass(frozen=True, slots=True)
+class Env:
+    """Settings read from the environment (and .env)."""
+
+    api_id: str | None
+    api_hash: str | None
+    phone: str | None
+    channel: str | None
+    max_messages: str  # raw MAX_MESSAGES; parsed only when --limit is not given
+    timezone: str
+    credentials_path: str | None
+    token_path: str
+    calendar_id: str
+    dry_run: bool  # DRY_RUN, used by scripts/run.py (the CLI uses --dry-run)
+
+    @classmethod
+    def from_environ(cls) -> "Env":
+        """Load .env and read all settings from os.environ."""
+        load_dotenv()
+        return cls(
+            api_id=os.getenv("TELEGRAM_API_ID"),
+            api_hash=os.getenv("TELEGRAM_API_HASH"),
+            phone=os.getenv("TELEGRAM_PHONE"),
+            channel=os.getenv("TELEGRAM_CHANNEL"),
+            max_messages=os.getenv("MAX_MESSAGES", "50"),
+            timezone=os.getenv("DEFAULT_TIMEZONE", "Europe/Kyiv"),
+            credentials_path=os.getenv("GOOGLE_CREDENTIALS_PATH"),
+            token_path=os.getenv("GOOGLE_TOKEN_PATH", "token.json"),
+            calendar_id=os.getenv("DEFAULT_CALENDAR_ID", "primary"),
+            dry_run=os.getenv("DRY_RUN", "true").lower() in ("1", "true", "yes"),
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def load_env() -> Env:
+    """Return the process-wide Env, reading the environment on first use."""
+    return Env.from_environ()
+
+
+# Partial-response mask for listing events: only the fields the CLI reads
+EVENT_LIST_FIELDS = "nextPageToken,items(id,summary,htmlLink,start/dateTime,end/dateTime)"
+
+
 def build_event_from_outage(outage: dict) -> dict:
     """Map an outage dict to a Google Calendar event body.
 
@@ -47,11 +92,14 @@ def build_event_from_outage(outage: dict) -> dict:
     Returns:
         Google Calendar event body dict
     """
-    summary = f"⚡ Відключення світла: {outage.get('location', 'Не вказано')}"
-    if outage.get("group"):
-        summary += f" (Група {outage['group']})"
-
-    body = {
+    location = outage.get("location", "Не вказано")
+    group = outage.get("group")
+    if group:
+        summary = f"⚡ Відключення світла: {location} (Група {group})"
+    else:
+        summary = f"⚡ Відключення світла: {location}"
+
+    return {
         "summary": summary,
         "description": outage.get("description", ""),
         # The scraper now produces timezone-aware ISO datetimes (with offset),
@@ -62,8 +110,6 @@ def build_event_from_outage(outage: dict) -> dict:
         "colorId": "11",  # Red color for outages
     }
 
-    return body
-
 
 async def main_async(argv=None):
     """Async main function."""
@@ -108,14 +154,14 @@ async def main_async(argv=None):
     )
     args = parser.parse_args(argv)
 
-    load_dotenv()
+    env = load_env()
 
     # Load Telegram credentials
-    api_id = os.getenv("TELEGRAM_API_ID")
-    api_hash = os.getenv("TELEGRAM_API_HASH")
-    phone = os.getenv("TELEGRAM_PHONE")
-    channel = args.channel or os.getenv("TELEGRAM_CHANNEL")
-    limit = args.limit or int(os.getenv("MAX_MESSAGES", "50"))
+    api_id = env.api_id
+    api_hash = env.api_hash
+    phone = env.phone
+    channel = args.channel or env.channel
+    limit = args.limit or int(env.max_messages)
 
     if not all([api_id, api_hash, phone, channel]):
         parser.error(
@@ -133,9 +179,8 @@ async def main_async(argv=None):
 
     # Prune older remainders: keep only events for today and tomorrow in the
     # configured timezone. This prevents creating events for past dates.
-    tz_name = os.getenv("DEFAULT_TIMEZONE", "Europe/Kyiv")
     try:
-        tz = ZoneInfo(tz_name)
+        tz = ZoneInfo(env.timezone)
     except ZoneInfoNotFoundError:
         tz = ZoneInfo("Europe/Kyiv")
 
@@ -159,9 +204,9 @@ async def main_async(argv=None):
 
     # If cleanup mode requested, connect to Google Calendar and remove old events
     if args.cleanup:
-        creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH")
-        token_path = os.getenv("GOOGLE_TOKEN_PATH", "token.json")
-        calendar_id = os.getenv("DEFAULT_CALENDAR_ID", "primary")
+        creds_path = env.credentials_path
+        token_path = env.token_path
+        calendar_id = env.calendar_id
 
         if not creds_path:
             print("GOOGLE_CREDENTIALS_PATH not set; cannot perform cleanup.")
@@ -179,12 +224,17 @@ async def main_async(argv=None):
         allowed = {today.isoformat(), tomorrow.isoformat()}
 
         # Define list window: from 30 days ago to 30 days ahead to find recent events
-        window_min = (datetime.now(tz) - timedelta(days=30)).isoformat()
-        window_max = (datetime.now(tz) + timedelta(days=30)).isoformat()
+        now = datetime.now(tz)
+        window_min = (now - timedelta(days=30)).isoformat()
+        window_max = (now + timedelta(days=30)).isoformat()
 
         candidates = []
         for ev in list_events(
-            service, calendar_id, time_min=window_min, time_max=window_max
+            service,
+            calendar_id,
+            time_min=window_min,
+            time_max=window_max,
+            fields=EVENT_LIST_FIELDS,
         ):
             summary = ev.get("summary", "")
             # Only consider events that look like our outage reminders
@@ -196,12 +246,11 @@ async def main_async(argv=None):
             if not start:
                 continue
 
-            try:
-                ev_date = datetime.fromisoformat(start).date()
-            except ValueError:
+            # RFC3339 dateTime starts with the event's local YYYY-MM-DD date
+            if len(start) < 10 or start[4] != "-" or start[7] != "-":
                 continue
 
-            if ev_date.isoformat() not in allowed:
+            if start[:10] not in allowed:
                 candidates.append(ev)
 
         if not candidates:
@@ -231,6 +280,9 @@ async def main_async(argv=None):
         print(f"Deleted {deleted} event(s)")
         return
 
+    # Build each event body once, in date order; the same list is used for
+    # printing and for creating events below.
+    all_events = []
     print(f"\nFound outages for {len(outages_by_date)} date(s):")
     for date_key, outages in sorted(outages_by_date.items()):
         print(f"\n{date_key}: {len(outages)} outage(s)")
@@ -240,6 +292,7 @@ async def main_async(argv=None):
                 continue
 
             event = build_event_from_outage(outage)
+            all_events.append(event)
             if args.dry_run:
                 print(f"  - {event['summary']}")
                 print(f"    Start: {event['start']['dateTime']}")
@@ -249,9 +302,9 @@ async def main_async(argv=None):
 
     if not args.dry_run:
         # Load Google Calendar credentials
-        creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH")
-        token_path = os.getenv("GOOGLE_TOKEN_PATH", "token.json")
-        calendar_id = os.getenv("DEFAULT_CALENDAR_ID", "primary")
+        creds_path = env.credentials_path
+        token_path = env.token_path
+        calendar_id = env.calendar_id
 
         if not creds_path:
             print(
@@ -261,7 +314,7 @@ async def main_async(argv=None):
             return
 
         from power_outage_remainder.calendar_integration import (
-            create_event,
+            create_events_batch_async,
             get_service,
             list_events,
         )
@@ -270,62 +323,52 @@ async def main_async(argv=None):
         print(f"\nChecking for existing events in calendar: {calendar_id}")
 
         # Fetch existing outage events within the time window (today and tomorrow)
-        window_min = (
-            datetime.combine(today, datetime.min.time()).replace(tzinfo=tz).isoformat()
-        )
-        window_max = (
-            datetime.combine(tomorrow, datetime.max.time())
-            .replace(tzinfo=tz)
-            .isoformat()
-        )
+        window_min = datetime(today.year, today.month, today.day, tzinfo=tz).isoformat()
+        window_max = datetime(
+            tomorrow.year, tomorrow.month, tomorrow.day, 23, 59, 59, 999999, tzinfo=tz
+        ).isoformat()
 
-        existing_events = []
+        # (summary, start, end) of existing outage events, for O(1) duplicate checks
+        existing_keys = set()
         for ev in list_events(
-            service, calendar_id, time_min=window_min, time_max=window_max
+            service,
+            calendar_id,
+            time_min=window_min,
+            time_max=window_max,
+            fields=EVENT_LIST_FIELDS,
         ):
             summary = ev.get("summary", "")
             # Only consider events that look like our outage reminders
             if summary.startswith("⚡ Відключення світла"):
-                existing_events.append(
-                    {
-                        "summary": summary,
-                        "start": ev.get("start", {}).get("dateTime"),
-                        "end": ev.get("end", {}).get("dateTime"),
-                    }
+                existing_keys.add(
+                    (
+                        summary,
+                        ev.get("start", {}).get("dateTime"),
+                        ev.get("end", {}).get("dateTime"),
+                    )
                 )
 
-        print(f"Found {len(existing_events)} existing outage event(s)")
+        print(f"Found {len(existing_keys)} existing outage event(s)")
 
-        def event_exists(new_event):
-            """Check if an event with the same summary, start, and end already exists."""
-            for existing in existing_events:
-                if (
-                    existing["summary"] == new_event["summary"]
-                    and existing["start"] == new_event["start"]["dateTime"]
-                    and existing["end"] == new_event["end"]["dateTime"]
-                ):
-                    return True
-            return False
-
-        created_count = 0
         skipped_count = 0
-        for date_key, outages in sorted(outages_by_date.items()):
-            for outage in outages:
-                # Apply same group filter before creating events
-                if args.group and (outage.get("group") != args.group):
-                    continue
-
-                event = build_event_from_outage(outage)
-
-                # Check if this event already exists
-                if event_exists(event):
-                    print(f"  ⊘ Skipped (already exists): {event['summary']}")
-                    skipped_count += 1
-                    continue
-
-                created = create_event(service, calendar_id, event)
-                print(f"  ✓ Created: {created.get('htmlLink')}")
-                created_count += 1
+        to_create = []
+        for event in all_events:
+            # Check if an event with the same summary, start and end exists
+            key = (
+                event["summary"],
+                event["start"]["dateTime"],
+                event["end"]["dateTime"],
+            )
+            if key in existing_keys:
+                print(f"  ⊘ Skipped (already exists): {event['summary']}")
+                skipped_count += 1
+                continue
+
+            to_create.append(event)
+
+        created_count, _ = await create_events_batch_async(
+            service, calendar_id, to_create
+        )
 
         print(
             f"\n✓ Successfully created {created_count} event(s), skipped {skipped_count} duplicate(s)"
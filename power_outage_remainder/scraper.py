@@ -4,11 +4,119 @@ This module fetches messages from a Telegram channel, detects outage schedule in
 and structures it into a dictionary format suitable for Google Calendar events.
 """
 
+import functools
 import os
 import re
-from datetime import datetime, timedelta
+import sys
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
-from typing import Any, Dict, List, Optional, cast
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+# Patterns are compiled once at import time; they run for every message.
+
+# Keywords that indicate outage information (matched against lowercased text).
+# Plain substring checks are much cheaper than a regex on non-matching chatter.
+_KEYWORDS = (
+    "відключення",
+    "вимкнення",
+    "графік",
+    "електропостачання",
+    "електроенергі",
+    "світло",
+    "без світла",
+)
+
+# Latin letters that look like Cyrillic ones and often slip into posts
+# (e.g. "вiдключення" typed with a Latin "i"). Mapping is one-to-one, so
+# match positions in the normalized text are valid in the original.
+_LOOKALIKES = str.maketrans("aceiopxyABCEHIKMOPTX", "асеіорхуАВСЕНІКМОРТХ")
+
+# translate() is slow on non-ASCII text, so only normalize when there is a
+# Latin letter to replace.
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
+# Time patterns (HH:MM format)
+_TIME_RE = re.compile(r"\d{1,2}[:.-]\d{2}")
+
+# Time ranges, dates and group numbers, found in a single pass over the text:
+# - range: "08:00-12:00", "08:00 - 12:00"
+# - from_to: "з 08:00 до 18:00"
+# - date_word: "10 листопада", "10 ноября"
+# - date_num: "10.11" (two-digit month only to avoid matching groups like "2.1")
+# - group: "Група 1.2", "групи 3"; never the start of a time range, so
+#   "Група: 08:00-12:00" yields the range rather than group "08"
+# Every alternative starts with a digit, "з" or "Г/г". The leading lookahead
+# checks that single character first, so positions that can't start a match
+# are skipped without trying each alternative in turn.
+_FIELDS_RE = re.compile(
+    r"(?=[\dзГг])(?:"
+    r"(?P<range>(?P<h1>\d{1,2})[:.](?P<m1>\d{2})\s*[-–—]\s*(?P<h2>\d{1,2})[:.](?P<m2>\d{2}))"
+    r"|(?P<from_to>з\s+(?P<fh1>\d{1,2})[:.](?P<fm1>\d{2})\s+до\s+(?P<fh2>\d{1,2})[:.](?P<fm2>\d{2}))"
+    r"|(?P<date_word>\b(?P<wday>\d{1,2})\s+(?P<wmonth>листопада|ноября|грудня|січня|лютого|февраля|березня|марта|квітня|апреля|травня|мая|червня|июня|липня|июля|серпня|августа|вересня|сентября|жовтня|октября|декабря)\b)"
+    r"|(?P<date_num>\b(?P<nday>\d{1,2})\.(?P<nmonth>\d{2})\b)"
+    r"|(?P<group>[Гг]руп[аи]?\s*(?:[:-]\s*)?(?!\d{1,2}[:.]\d{2}\s*[-–—])(?P<gid>\d+(?:\.\d+)*))"
+    r")"
+)
+
+# Month names (Ukrainian and Russian genitive) to month numbers
+_MONTH_MAP: Dict[str, int] = {
+    "січня": 1,
+    "января": 1,
+    "лютого": 2,
+    "февраля": 2,
+    "березня": 3,
+    "марта": 3,
+    "квітня": 4,
+    "апреля": 4,
+    "травня": 5,
+    "мая": 5,
+    "червня": 6,
+    "июня": 6,
+    "липня": 7,
+    "июля": 7,
+    "серпня": 8,
+    "августа": 8,
+    "вересня": 9,
+    "сентября": 9,
+    "жовтня": 10,
+    "октября": 10,
+    "листопада": 11,
+    "ноября": 11,
+    "грудня": 12,
+    "декабря": 12,
+}
+
+# Address patterns, tried in order
+_ADDR_RES: Tuple[re.Pattern, ...] = tuple(
+    re.compile(p, re.IGNORECASE)
+    for p in (
+        r"вул\.\s+([^\n,;]+)",
+        r"вулиця\s+([^\n,;]+)",
+        r"район[іи]?\s+([^\n,;]+)",
+        r"черга\s+(\d+)",
+    )
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_tz(name: str) -> ZoneInfo:
+    """Return the ZoneInfo for name (fallback to Europe/Kyiv), cached per name."""
+    try:
+        return ZoneInfo(name)
+    except Exception:
+        return ZoneInfo("Europe/Kyiv")
+
+
+@functools.lru_cache(maxsize=256)
+def _local_iso(tz: ZoneInfo, day: date, hour: int, minute: int) -> str:
+    """Return the ISO timestamp (with UTC offset) of a local wall-clock time.
+
+    Schedules repeat the same few dates and times, so the formatted strings
+    are cached; the offset still comes from tz, which handles DST.
+    """
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz).isoformat()
 
 
 async def fetch_channel_messages(
@@ -17,9 +125,12 @@ async def fetch_channel_messages(
     phone: Optional[str],
     channel: str,
     limit: int = 50,
-) -> List[Dict]:
+) -> AsyncIterator[Dict]:
     """Fetch recent messages from a Telegram channel.
 
+    Messages are yielded as Telethon delivers them, so callers can process
+    each one without holding the whole batch in memory.
+
     Args:
         api_id: Telegram API ID (from my.telegram.org)
         api_hash: Telegram API hash
@@ -27,8 +138,8 @@ async def fetch_channel_messages(
         channel: Channel username (e.g., '@dtek_kyiv' or channel URL)
         limit: Maximum number of messages to fetch
 
-    Returns:
-        List of message dictionaries with 'id', 'date', 'text' fields
+    Yields:
+        Message dictionaries with 'id', 'date', 'text' fields
     """
     try:
         from telethon import TelegramClient
@@ -46,7 +157,6 @@ async def fetch_channel_messages(
     bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
     session_file = Path("session_name.session")
 
-    messages = []
     try:
         # Prefer restored user session, but don't call start() without args
         # because that may trigger interactive prompts. Instead, connect and
@@ -96,9 +206,7 @@ async def fetch_channel_messages(
         # Fetch messages from channel
         async for message in client.iter_messages(channel, limit=limit):
             if message.text:
-                messages.append(
-                    {"id": message.id, "date": message.date, "text": message.text}
-                )
+                yield {"id": message.id, "date": message.date, "text": message.text}
     finally:
         try:
             await client.disconnect()  # type: ignore
@@ -106,8 +214,6 @@ async def fetch_channel_messages(
             # Best-effort disconnect; ignore errors during cleanup
             pass
 
-    return messages
-
 
 def is_outage_message(text: str) -> bool:
     """Check if a message contains outage schedule information.
@@ -122,25 +228,18 @@ def is_outage_message(text: str) -> bool:
     if not text:
         return False
 
+    # Most channel messages are chatter without any keyword; rule those out
+    # with substring checks before running the time regex.
     text_lower = text.lower()
+    if not any(keyword in text_lower for keyword in _KEYWORDS):
+        # Retry with Latin lookalikes replaced, if there are any
+        if not _LATIN_RE.search(text_lower):
+            return False
+        text_lower = text_lower.translate(_LOOKALIKES)
+        if not any(keyword in text_lower for keyword in _KEYWORDS):
+            return False
 
-    # Keywords that indicate outage information
-    keywords = [
-        "відключення",
-        "вимкнення",
-        "графік",
-        "електропостачання",
-        "електроенергі",
-        "світло",
-        "без світла",
-    ]
-
-    has_keyword = any(keyword in text_lower for keyword in keywords)
-
-    # Check for time patterns (HH:MM format)
-    has_time = bool(re.search(r"\d{1,2}[:.-]\d{2}", text))
-
-    return has_keyword and has_time
+    return bool(_TIME_RE.search(text))
 
 
 def extract_outage_info(text: str, message_date: datetime) -> List[Dict[str, Any]]:
@@ -151,80 +250,67 @@ def extract_outage_info(text: str, message_date: datetime) -> List[Dict[str, Any
         message_date: Date when the message was posted
 
     Returns:
-        List of dictionaries with keys: 'start', 'end', 'location', 'description', 'group'.
+        List of dictionaries with keys: 'start', 'end', 'location', 'description',
+        'group' and 'date_key' (the YYYY-MM-DD date of 'start').
         The list contains one entry per time range found in the message. Returns an
         empty list if parsing fails or no time ranges are found.
+
+    Each time range belongs to the nearest group mentioned before it (posts are
+    usually laid out as "Група X: time1, time2"); ranges that precede every group
+    mention belong to the first group in the message.
     """
     if not text:
         return []
 
-    # Extract time ranges (e.g., "08:00-12:00", "08:00 - 12:00", "з 08:00 до 18:00")
-    time_patterns = [
-        r"(\d{1,2})[:.](\d{2})\s*[-–—]\s*(\d{1,2})[:.](\d{2})",  # 08:00-12:00
-        r"з\s+(\d{1,2})[:.](\d{2})\s+до\s+(\d{1,2})[:.](\d{2})",  # з 08:00 до 18:00
-    ]
-
     times = []
-    for pattern in time_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            for match in matches:
-                if len(match) == 4:
-                    start_h, start_m, end_h, end_m = match
-                    times.append(
-                        {
-                            "start": (int(start_h), int(start_m)),
-                            "end": (int(end_h), int(end_m)),
-                        }
-                    )
-
-    # Extract date if mentioned (e.g., "10.11", "10 листопада", "10 ноября")
-    # Match either DD.MM format or "DD month_name" but avoid matching group numbers like "2.1"
-    date_patterns = [
-        r"\b(\d{1,2})\s+(листопада|ноября|грудня|січня|лютого|февраля|березня|марта|квітня|апреля|травня|мая|червня|июня|липня|июля|серпня|августа|вересня|сентября|жовтня|октября|декабря)\b",  # "10 листопада"
-        r"\b(\d{1,2})\.(\d{2})\b",  # "10.11" (two-digit month only to avoid "2.1")
-    ]
+    date_word = None
+    date_num = None
+    first_group = None
+    current_group = None
+    # Match against normalized text; captured free text is taken from the
+    # original by position so addresses keep their spelling.
+    normalized = text.translate(_LOOKALIKES) if _LATIN_RE.search(text) else text
+
+    for m in _FIELDS_RE.finditer(normalized):
+        kind = m.lastgroup
+        if kind == "range":
+            times.append(
+                {
+                    "start": (int(m["h1"]), int(m["m1"])),
+                    "end": (int(m["h2"]), int(m["m2"])),
+                    "group": current_group,
+                }
+            )
+        elif kind == "from_to":
+            times.append(
+                {
+                    "start": (int(m["fh1"]), int(m["fm1"])),
+                    "end": (int(m["fh2"]), int(m["fm2"])),
+                    "group": current_group,
+                }
+            )
+        elif kind == "date_word" and date_word is None:
+            date_word = (m["wday"], m["wmonth"])
+        elif kind == "date_num" and date_num is None:
+            date_num = (m["nday"], m["nmonth"])
+        elif kind == "group":
+            current_group = m["gid"]
+            if first_group is None:
+                first_group = current_group
+
+    # Nothing to schedule without a time range; skip date/address parsing
+    if not times:
+        return []
 
+    # Use the date if mentioned, preferring a month name over DD.MM
     target_date = message_date.date()
-    date_match = None
-    for pattern in date_patterns:
-        date_match = re.search(pattern, text)
-        if date_match:
-            break
+    date_match = date_word or date_num
 
     if date_match:
-        day_str = date_match.group(1)
-        month_part = date_match.group(2)
+        day_str, month_part = date_match
 
         # Try to parse the month
-        month_map = {
-            "січня": 1,
-            "января": 1,
-            "лютого": 2,
-            "февраля": 2,
-            "березня": 3,
-            "марта": 3,
-            "квітня": 4,
-            "апреля": 4,
-            "травня": 5,
-            "мая": 5,
-            "червня": 6,
-            "июня": 6,
-            "липня": 7,
-            "июля": 7,
-            "серпня": 8,
-            "августа": 8,
-            "вересня": 9,
-            "сентября": 9,
-            "жовтня": 10,
-            "октября": 10,
-            "листопада": 11,
-            "ноября": 11,
-            "грудня": 12,
-            "декабря": 12,
-        }
-
-        month = month_map.get(month_part.lower())
+        month = _MONTH_MAP.get(month_part.lower())
         if not month:
             try:
                 month = int(month_part)
@@ -243,84 +329,108 @@ def extract_outage_info(text: str, message_date: datetime) -> List[Dict[str, Any
         except ValueError:
             target_date = message_date.date()
 
-    # Extract location/address/group info
-    location = ""
-    group_match = re.search(r"[Гг]руп[аи]?\s*[:-]?\s*(\d+[.\d]*)", text)
-    if group_match:
-        location = f"Група {group_match.group(1)}"
-
     # Extract address patterns
-    address_patterns = [
-        r"вул\.\s+([^\n,;]+)",
-        r"вулиця\s+([^\n,;]+)",
-        r"район[іи]?\s+([^\n,;]+)",
-        r"черга\s+(\d+)",
-    ]
-
-    for pattern in address_patterns:
-        addr_match = re.search(pattern, text, re.IGNORECASE)
+    address = ""
+    for pattern in _ADDR_RES:
+        addr_match = pattern.search(normalized)
         if addr_match:
-            if location:
-                location += f", {addr_match.group(1).strip()}"
-            else:
-                location = addr_match.group(1).strip()
+            address = text[addr_match.start(1) : addr_match.end(1)].strip()
             break
 
-    if not location:
-        location = "Не вказано"
+    # Schedules repeat the same locations, groups and (for re-posts) texts
+    # across messages; intern them so equal values share one object.
+    description = sys.intern(text[:500])  # Limit description length
+    locations: Dict[Optional[str], str] = {}
+
+    # Make datetimes timezone-aware using DEFAULT_TIMEZONE (fallback to Europe/Kyiv)
+    tz = _get_tz(os.environ.get("DEFAULT_TIMEZONE", "Europe/Kyiv"))
+
+    # Every range starts on target_date, so the grouping key is shared
+    date_key = target_date.isoformat()
 
     # Build result dictionaries for each time range found
     results: List[Dict[str, Any]] = []
     for time_info in times:
         start_h, start_m = time_info["start"]
         end_h, end_m = time_info["end"]
-
-        # Make datetimes timezone-aware using DEFAULT_TIMEZONE (fallback to Europe/Kyiv)
-        tz_name = os.getenv("DEFAULT_TIMEZONE", "Europe/Kyiv")
-        try:
-            tz = ZoneInfo(tz_name)
-        except Exception:
-            tz = ZoneInfo("Europe/Kyiv")
-
-        start_dt = datetime(
-            target_date.year,
-            target_date.month,
-            target_date.day,
-            start_h,
-            start_m,
-            tzinfo=tz,
-        )
-        end_dt = datetime(
-            target_date.year,
-            target_date.month,
-            target_date.day,
-            end_h,
-            end_m,
-            tzinfo=tz,
-        )
+        group_id = time_info["group"] or first_group
+        if group_id is not None:
+            group_id = sys.intern(group_id)
+
+        # Location combines the group and address, e.g. "Група 1.2, Хрещатик 1"
+        location = locations.get(group_id)
+        if location is None:
+            parts = [f"Група {group_id}"] if group_id else []
+            if address:
+                parts.append(address)
+            location = sys.intern(", ".join(parts) or "Не вказано")
+            locations[group_id] = location
 
         # Handle overnight outages (e.g., 23:00-02:00)
-        if end_dt <= start_dt:
-            end_dt += timedelta(days=1)
+        end_date = target_date
+        if (end_h, end_m) <= (start_h, start_m):
+            end_date = target_date + timedelta(days=1)
 
         results.append(
             {
-                # isoformat() will include the offset (e.g. +02:00) which is accepted by
+                # The ISO strings include the offset (e.g. +02:00) which is accepted by
                 # Google Calendar API and removes the need to pass a separate timeZone.
-                "start": start_dt.isoformat(),
-                "end": end_dt.isoformat(),
+                "start": _local_iso(tz, target_date, start_h, start_m),
+                "end": _local_iso(tz, end_date, end_h, end_m),
                 "location": location,
-                "description": text[:500],  # Limit description length
-                "group": group_match.group(1) if group_match else None,
+                "description": description,
+                "group": group_id,
+                "date_key": date_key,
             }
         )
 
     # Return all found time ranges so callers can create one calendar event per
-    # time window. Older code expected a single dict; the parser below handles
-    # both list and dict results for backward compatibility.
+    # time window.
     return results
 
 
+def _message_outages(
+    msg: Dict, seen: Set[Tuple[str, str, str, Optional[str]]]
+) -> Iterator[Tuple[str, Dict]]:
+    """Parse a single message and yield (date_key, outage) for its new outages.
+
+    seen holds (start, end, location, group) of outages already yielded, so a
+    schedule that was re-posted or forwarded is only kept once.
+    """
+    text = msg.get("text", "")
+    msg_date = msg.get("date")
+
+    if not is_outage_message(text):
+        return
+
+    # One outage dict per time range, already carrying its date key
+    for outage_dict in extract_outage_info(text, msg_date):  # type: ignore
+        date_key = outage_dict.pop("date_key")
+
+        key = (
+            outage_dict["start"],
+            outage_dict["end"],
+            outage_dict["location"],
+            outage_dict.get("group"),
+        )
+        if key in seen:
+            continue
+        seen.add(key)
+
+        yield date_key, outage_dict
+
+
+def _group_by_date(items: Iterable[Tuple[str, Dict]]) -> Dict[str, List[Dict]]:
+    """Collect (date_key, outage) pairs into a dict with dates in chronological order."""
+    outages_by_date: Dict[str, List[Dict]] = defaultdict(list)
+
+    for date_key, outage in items:
+        outages_by_date[date_key].append(outage)
+
+    # ISO date strings sort chronologically; return a plain dict
+    return dict(sorted(outages_by_date.items()))
+
+
 def parse_messages_to_dict(messages: List[Dict]) -> Dict[str, List[Dict]]:
     """Parse Telegram messages and organize outages by date.
 
@@ -328,56 +438,39 @@ def parse_messages_to_dict(messages: List[Dict]) -> Dict[str, List[Dict]]:
         messages: List of message dicts from fetch_channel_messages
 
     Returns:
-        Dictionary mapping date strings (YYYY-MM-DD) to lists of outage info dicts
+        Dictionary mapping date strings (YYYY-MM-DD) to lists of outage info dicts,
+        with dates in chronological order
     """
-    outages_by_date = {}
-
-    for msg in messages:
-        text = msg.get("text", "")
-        msg_date = msg.get("date")
-
-        if not is_outage_message(text):
-            continue
+    seen: Set[Tuple[str, str, str, Optional[str]]] = set()
 
-        outage_info = extract_outage_info(text, msg_date)  # type: ignore
-        if not outage_info:
-            continue
+    return _group_by_date(
+        item for msg in messages for item in _message_outages(msg, seen)
+    )
 
-        # extract_outage_info now returns a list of outage dicts (one per time
-        # range). For backward compatibility accept a single dict as well.
-        candidates: List[Dict[str, Any]] = []
-        if isinstance(outage_info, dict):
-            candidates = [cast(Dict[str, Any], outage_info)]
-        elif isinstance(outage_info, list):
-            candidates = cast(List[Dict[str, Any]], outage_info)
-        else:
-            # skip unexpected types (defensive programming)
-            continue
 
-        for outage_dict in candidates:
-            # Safely retrieve the ISO start string and validate it before parsing
-            start_iso = (
-                outage_dict.get("start") if isinstance(outage_dict, dict) else None
-            )
-            if not isinstance(start_iso, str):
-                # skip entries without a valid start datetime string
-                continue
+async def iter_outages(messages: AsyncIterator[Dict]) -> AsyncIterator[Tuple[str, Dict]]:
+    """Yield (date_key, outage) pairs as messages arrive from an async source.
 
-            # Parse the start datetime to get the date key
-            try:
-                start_dt = datetime.fromisoformat(start_iso)
-            except (ValueError, TypeError):
-                # skip invalid datetime formats
-                continue
+    Messages are parsed one at a time and dropped once parsed, so memory
+    use does not grow with the number of messages. Outages are yielded in
+    message order and re-posted schedules are skipped.
+    """
+    seen: Set[Tuple[str, str, str, Optional[str]]] = set()
 
-            date_key = start_dt.strftime("%Y-%m-%d")
+    async for msg in messages:
+        for item in _message_outages(msg, seen):
+            yield item
 
-            if date_key not in outages_by_date:
-                outages_by_date[date_key] = []
 
-            outages_by_date[date_key].append(outage_dict)
+async def parse_messages_to_dict_async(
+    messages: AsyncIterator[Dict],
+) -> Dict[str, List[Dict]]:
+    """Streaming variant of parse_messages_to_dict for an async message source.
 
-    return outages_by_date
+    Only the resulting outages are kept in memory. Dates are in
+    chronological order.
+    """
+    return _group_by_date([item async for item in iter_outages(messages)])
 
 
 async def fetch_and_parse_outages(
@@ -393,7 +486,7 @@ async def fetch_and_parse_outages(
         limit: Max messages to fetch
 
     Returns:
-        Dictionary mapping dates to lists of outage info
+        Dictionary mapping dates to lists of outage info, in chronological order
     """
-    messages = await fetch_channel_messages(api_id, api_hash, phone, channel, limit)
-    return parse_messages_to_dict(messages)
+    messages = fetch_channel_messages(api_id, api_hash, phone, channel, limit)
+    return await parse_messages_to_dict_async(messages)
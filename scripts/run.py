@@ -5,26 +5,26 @@ This script loads environment variables and uses async to fetch messages.
 
 from pathlib import Path
 import sys
-import os
 import asyncio
-from dotenv import load_dotenv
 
 # Ensure the project root is on sys.path when running this script directly
 # (so imports like `from power_outage_remainder.scraper ...` work).
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from power_outage_remainder.cli import build_event_from_outage, load_env  # noqa: E402
+from power_outage_remainder.scraper import fetch_and_parse_outages  # noqa: E402
+
 
 async def main():
     """Run scraper and create calendar events"""
-    load_dotenv()
-
-    # Load config from env
-    api_id = os.getenv("TELEGRAM_API_ID")
-    api_hash = os.getenv("TELEGRAM_API_HASH")
-    phone = os.getenv("TELEGRAM_PHONE")
-    channel = os.getenv("TELEGRAM_CHANNEL")
-    limit = int(os.getenv("MAX_MESSAGES", "50"))
-    dry_run = os.getenv("DRY_RUN", "true").lower() in ("1", "true", "yes")
+    # Load config from env (and .env), read once per process
+    env = load_env()
+    api_id = env.api_id
+    api_hash = env.api_hash
+    phone = env.phone
+    channel = env.channel
+    limit = int(env.max_messages)
+    dry_run = env.dry_run
 
     if not all([api_id, api_hash, phone, channel]):
         raise SystemExit(
@@ -32,9 +32,6 @@ async def main():
               TELEGRAM_API_HASH, TELEGRAM_PHONE, TELEGRAM_CHANNEL"
         )
 
-    from power_outage_remainder.scraper import fetch_and_parse_outages
-    from power_outage_remainder.cli import build_event_from_outage
-
     print(f"Fetching up to {limit} messages from {channel}...")
     outages_by_date = await fetch_and_parse_outages(
         int(api_id), api_hash, phone, channel, limit  # type: ignore
@@ -48,7 +45,7 @@ async def main():
 
     if dry_run:
         print("\n=== DRY RUN MODE ===")
-        for date_key, outages in sorted(outages_by_date.items()):
+        for date_key, outages in outages_by_date.items():
             print(f"\n{date_key}: {len(outages)} outage(s)")
             for outage in outages:
                 event = build_event_from_outage(outage)
@@ -57,9 +54,9 @@ async def main():
         return
 
     # Real mode: create calendar events
-    creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH")
-    token_path = os.getenv("GOOGLE_TOKEN_PATH", "token.json")
-    calendar_id = os.getenv("DEFAULT_CALENDAR_ID", "primary")
+    creds_path = env.credentials_path
+    token_path = env.token_path
+    calendar_id = env.calendar_id
 
     if not creds_path:
         print(
@@ -67,18 +64,21 @@ async def main():
         )
         return
 
-    from power_outage_remainder.calendar_integration import get_service, create_event
+    from power_outage_remainder.calendar_integration import (
+        create_events_batch_async,
+        get_service,
+    )
 
     service = get_service(creds_path, token_path)
     print(f"\nCreating events in calendar: {calendar_id}")
 
-    created_count = 0
-    for date_key, outages in sorted(outages_by_date.items()):
-        for outage in outages:
-            event = build_event_from_outage(outage)
-            created = create_event(service, calendar_id, event)
-            print(f"  ✓ {created.get('htmlLink')}")
-            created_count += 1
+    events = [
+        build_event_from_outage(outage)
+        for date_key, outages in outages_by_date.items()
+        for outage in outages
+    ]
+
+    created_count, _ = await create_events_batch_async(service, calendar_id, events)
 
     print(f"\n✓ Successfully created {created_count} event(s)")
 
@@ -32,3 +32,107 @@ def test_create_event_called():
     res = create_event(fake_service, "testcal", body)
     assert res["id"] == "fake123"
     assert executed["body"] == body
+
+
+def test_create_events_batch_splits_and_orders_results():
+    """Inserts are grouped into batches and results keep the input order."""
+    batches = []
+
+    class FakeInsert:
+        def __init__(self, body):
+            self.body = body
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self._callback = callback
+            self._requests = []
+            batches.append(self._requests)
+
+        def add(self, request, request_id):
+            self._requests.append((request_id, request))
+
+        def execute(self):
+            for request_id, request in self._requests:
+                if request.body["summary"] == "bad":
+                    self._callback(request_id, None, ValueError("boom"))
+                else:
+                    self._callback(request_id, {"id": request.body["summary"]}, None)
+
+    class FakeEvents:
+        def insert(self, calendarId, body):
+            assert calendarId == "testcal"
+            return FakeInsert(body)
+
+    class FakeService:
+        def events(self):
+            return FakeEvents()
+
+        def new_batch_http_request(self, callback):
+            return FakeBatch(callback)
+
+    from power_outage_remainder.calendar_integration import (
+        BATCH_SIZE,
+        create_events_batch,
+    )
+
+    events = [{"summary": str(i)} for i in range(BATCH_SIZE + 2)]
+    events[3] = {"summary": "bad"}
+    results = create_events_batch(FakeService(), "testcal", events)
+
+    assert [len(b) for b in batches] == [BATCH_SIZE, 2]
+    assert isinstance(results[3], ValueError)
+    assert results[0] == {"id": "0"}
+    assert results[-1] == {"id": str(BATCH_SIZE + 1)}
+
+
+def test_create_events_batch_async_counts_results(monkeypatch, capsys):
+    """The async wrapper reports each insert and returns (created, failed)."""
+    import asyncio
+
+    import power_outage_remainder.calendar_integration as ci
+
+    def fake_batch(service, calendar_id, events):
+        return [{"htmlLink": "http://example.com/ok"}, ValueError("boom")]
+
+    monkeypatch.setattr(ci, "create_events_batch", fake_batch)
+
+    events = [{"summary": "ok"}, {"summary": "bad"}]
+    result = asyncio.run(ci.create_events_batch_async(None, "testcal", events))
+    out = capsys.readouterr().out
+
+    assert result == (1, 1)
+    assert "✓ Created: http://example.com/ok" in out
+    assert "✗ Failed to create bad: boom" in out
+
+
+def test_list_events_follows_page_tokens():
+    """All pages are fetched, in order, until no nextPageToken is returned."""
+    pages = {
+        None: {"items": [{"id": "a"}, {"id": "b"}], "nextPageToken": "p2"},
+        "p2": {"items": [{"id": "c"}], "nextPageToken": "p3"},
+        "p3": {"items": [{"id": "d"}]},
+    }
+    requested = []
+
+    class FakeList:
+        def __init__(self, page_token):
+            self._page_token = page_token
+
+        def execute(self):
+            requested.append(self._page_token)
+            return pages[self._page_token]
+
+    class FakeEvents:
+        def list(self, calendarId, pageToken=None, **kwargs):
+            assert calendarId == "testcal"
+            return FakeList(pageToken)
+
+    class FakeService:
+        def events(self):
+            return FakeEvents()
+
+    from power_outage_remainder.calendar_integration import list_events
+
+    ids = [ev["id"] for ev in list_events(FakeService(), "testcal")]
+    assert ids == ["a", "b", "c", "d"]
+    assert requested == [None, "p2", "p3"]
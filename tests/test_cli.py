@@ -1,5 +1,16 @@
 import asyncio
 
+import pytest
+
+
+@pytest.fixture(scope="module")
+def loop():
+    """Event loop shared by the CLI tests in this module."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(loop.shutdown_default_executor())
+    loop.close()
+
 
 async def _fake_fetch(*args, **kwargs):
     # Return two outages on the same date with different groups
@@ -23,29 +34,39 @@ async def _fake_fetch(*args, **kwargs):
     }
 
 
-def run_main_and_capture(monkeypatch, argv):
-    """Helper to run main_async with monkeypatch in place and capture printed output."""
-    # Ensure required env vars are present
-    monkeypatch.setenv("TELEGRAM_API_ID", "1")
-    monkeypatch.setenv("TELEGRAM_API_HASH", "x")
-    monkeypatch.setenv("TELEGRAM_PHONE", "p")
-    monkeypatch.setenv("TELEGRAM_CHANNEL", "chan")
-
-    # Patch scraper.fetch_and_parse_outages to our fake
+@pytest.fixture(scope="module", autouse=True)
+def _patched_cli():
+    """Patch the env and the scraper once for every test in this module."""
     import power_outage_remainder.scraper as scraper_mod
+    from power_outage_remainder.cli import load_env
+
+    with pytest.MonkeyPatch.context() as mp:
+        # Ensure required env vars are present
+        mp.setenv("TELEGRAM_API_ID", "1")
+        mp.setenv("TELEGRAM_API_HASH", "x")
+        mp.setenv("TELEGRAM_PHONE", "p")
+        mp.setenv("TELEGRAM_CHANNEL", "chan")
+
+        # Patch scraper.fetch_and_parse_outages to our fake
+        mp.setattr(scraper_mod, "fetch_and_parse_outages", _fake_fetch)
+
+        # Settings are cached per process; re-read them with the patched env
+        load_env.cache_clear()
+        yield
+    load_env.cache_clear()
 
-    monkeypatch.setattr(scraper_mod, "fetch_and_parse_outages", _fake_fetch)
 
-    # Run the CLI main_async and capture stdout
+def run_main_and_capture(loop, argv):
+    """Helper to run main_async on the shared loop; output is captured by capsys."""
     from power_outage_remainder.cli import main_async
 
-    return asyncio.run(main_async(argv))
+    return loop.run_until_complete(main_async(argv))
 
 
-def test_cli_group_filter_dry_run(monkeypatch, capsys):
+def test_cli_group_filter_dry_run(capsys, loop):
     """When --group=1.2 is passed in dry-run, only events for group 1.2 are printed."""
     # Run and capture (main_async prints to stdout)
-    run_main_and_capture(monkeypatch, ["--dry-run", "--group", "1.2"])
+    run_main_and_capture(loop, ["--dry-run", "--group", "1.2"])
     captured = capsys.readouterr()
     out = captured.out
 
@@ -53,9 +74,9 @@ def test_cli_group_filter_dry_run(monkeypatch, capsys):
     assert "Група 2.1" not in out and "(Група 2.1)" not in out
 
 
-def test_cli_no_group_shows_all(monkeypatch, capsys):
+def test_cli_no_group_shows_all(capsys, loop):
     """Without --group both outages should be printed in dry-run."""
-    run_main_and_capture(monkeypatch, ["--dry-run"])
+    run_main_and_capture(loop, ["--dry-run"])
     captured = capsys.readouterr()
     out = captured.out
 
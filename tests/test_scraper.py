@@ -1,11 +1,14 @@
 """Test scraper module functions"""
 
+import asyncio
 from datetime import datetime
 from typing import cast, Dict, Any
 from power_outage_remainder.scraper import (
     is_outage_message,
     extract_outage_info,
+    iter_outages,
     parse_messages_to_dict,
+    parse_messages_to_dict_async,
 )
 
 
@@ -21,6 +24,13 @@ def test_is_outage_message_negative():
     assert is_outage_message(text) is False
 
 
+def test_is_outage_message_latin_lookalikes():
+    """Keywords typed with Latin lookalike letters are still detected."""
+    # "вiдключення" with a Latin "i", "cвітла" with a Latin "c"
+    text = "Графік вiдключення cвітла: 08:00-12:00"
+    assert is_outage_message(text) is True
+
+
 def test_extract_outage_info_basic():
     """Test extraction of outage info from a simple message."""
     text = "Відключення світла: Група 1, 10.11.2025, 08:00-12:00"
@@ -53,6 +63,30 @@ def test_extract_outage_info_with_time_range():
     assert end.startswith("2025-11-09T18:00")
 
 
+def test_extract_outage_info_assigns_groups_per_range():
+    """Each time range takes the group listed before it."""
+    text = (
+        "Графік відключень 10.11:\n"
+        "Група 1.1: 08:00-12:00, 16:00-20:00\n"
+        "Група 1.2: 12:00-16:00"
+    )
+    result = extract_outage_info(text, datetime(2025, 11, 10, 7, 0, 0))
+
+    assert [r["group"] for r in result] == ["1.1", "1.1", "1.2"]
+    assert result[2]["location"] == "Група 1.2"
+
+
+def test_extract_outage_info_group_label_before_range():
+    """A range right after "Група" is kept instead of being read as a group id."""
+    text = "Відключення світла. Група: 08:00-12:00, 14:00-16:00"
+    result = extract_outage_info(text, datetime(2025, 11, 10, 7, 0, 0))
+
+    assert [(r["start"][11:16], r["end"][11:16]) for r in result] == [
+        ("08:00", "12:00"),
+        ("14:00", "16:00"),
+    ]
+
+
 def test_parse_messages_to_dict():
     """Test parsing multiple messages into organized dict."""
     messages = [
@@ -80,3 +114,86 @@ def test_parse_messages_to_dict():
     assert "2025-11-11" in result
     assert len(result["2025-11-10"]) >= 1
     assert len(result["2025-11-11"]) >= 1
+
+
+def test_parse_messages_to_dict_skips_reposted_schedules():
+    """The same schedule posted twice produces a single outage."""
+    text = "Відключення світла 10.11: Група 1, 08:00-12:00"
+    messages = [
+        {"id": 1, "date": datetime(2025, 11, 10, 9, 0, 0), "text": text},
+        {"id": 2, "date": datetime(2025, 11, 10, 11, 0, 0), "text": text},
+    ]
+
+    result = parse_messages_to_dict(messages)
+
+    assert len(result["2025-11-10"]) == 1
+
+
+def test_parse_messages_to_dict_orders_dates():
+    """Dates come out in chronological order even when messages are newest-first."""
+    messages = [
+        {
+            "id": 2,
+            "date": datetime(2025, 11, 11, 9, 0, 0),
+            "text": "Графік відключень 11.11: 14:00-17:00, Група 2",
+        },
+        {
+            "id": 1,
+            "date": datetime(2025, 11, 10, 9, 0, 0),
+            "text": "Відключення світла 10.11: Група 1, 08:00-12:00",
+        },
+    ]
+
+    result = parse_messages_to_dict(messages)
+
+    assert list(result) == ["2025-11-10", "2025-11-11"]
+
+
+async def _aiter_messages(messages):
+    """Yield messages like fetch_channel_messages does."""
+    for msg in messages:
+        yield msg
+
+
+def test_parse_messages_to_dict_async():
+    """The streaming parser orders dates, skips re-posts and chatter."""
+    repost = "Відключення світла 10.11: Група 1, 08:00-12:00"
+    # Newest first, as Telethon returns them
+    messages = [
+        {
+            "id": 4,
+            "date": datetime(2025, 11, 11, 9, 0, 0),
+            "text": "Графік відключень 11.11: 14:00-17:00, Група 2",
+        },
+        {"id": 3, "date": datetime(2025, 11, 10, 11, 0, 0), "text": repost},
+        {"id": 2, "date": datetime(2025, 11, 10, 10, 0, 0), "text": "Доброго ранку!"},
+        {"id": 1, "date": datetime(2025, 11, 10, 9, 0, 0), "text": repost},
+    ]
+
+    result = asyncio.run(parse_messages_to_dict_async(_aiter_messages(messages)))
+
+    assert list(result) == ["2025-11-10", "2025-11-11"]
+    assert len(result["2025-11-10"]) == 1
+    assert len(result["2025-11-11"]) == 1
+
+
+def test_iter_outages_yields_in_message_order():
+    """Outages are yielded per message as (date_key, outage), without re-posts."""
+    repost = "Відключення світла 10.11: Група 1, 08:00-12:00"
+    messages = [
+        {
+            "id": 3,
+            "date": datetime(2025, 11, 11, 9, 0, 0),
+            "text": "Графік відключень 11.11: 14:00-17:00, Група 2",
+        },
+        {"id": 2, "date": datetime(2025, 11, 10, 11, 0, 0), "text": repost},
+        {"id": 1, "date": datetime(2025, 11, 10, 9, 0, 0), "text": repost},
+    ]
+
+    async def _collect():
+        return [item async for item in iter_outages(_aiter_messages(messages))]
+
+    result = asyncio.run(_collect())
+
+    assert [date_key for date_key, _ in result] == ["2025-11-11", "2025-11-10"]
+    assert [outage["group"] for _, outage in result] == ["2", "1"]